@@ -6,94 +6,190 @@ This script analyzes California's electricity generation by fuel type from 2014-
 It auto-detects EIA CSV files, processes fuel categories, and generates insights
 about the energy transition with corrected visualizations.
 
-Usage: python main.py
+Usage: python main.py [--skip-viz] [--force]
 
 Features:
 - Auto-detects CSV in data/ folder
+- Caches the parsed CSV as Parquet in data/.cache/ (requires pyarrow)
+- Memoizes processed data and statistics in output/.cache/
 - Cleans and aggregates fuel categories
 - Exports data, analysis results, and corrected stacked area chart
+  (skipped when the outputs are already current for this data and code)
 - Provides concise summary of key energy transition trends
 
 Author: California Energy Analysis Project
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
+import argparse
+import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
+from src.analysis import CaliforniaEnergyAnalyzer, input_fingerprint
 
-from analysis import CaliforniaEnergyAnalyzer
 
+# Prefer common EIA naming that indicates net generation by fuel (in priority order)
+PREFERRED_DATA_FILES = (
+    "Net_generation_for_California.csv",
+    "eia_california_generation_annual.csv",
+)
+
+
+def find_data_csv(data_dir):
+    """Return the CSV to analyze from data_dir, or None if it has none.
+
+    One directory read: preferred names win in priority order, otherwise the
+    first other CSV seen is used.
+    """
+    preferred_hits = {}
+    fallback = None
+    try:
+        with os.scandir(data_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".csv") or not entry.is_file():
+                    continue
+                if entry.name in PREFERRED_DATA_FILES:
+                    preferred_hits[entry.name] = entry.path
+                    if entry.name == PREFERRED_DATA_FILES[0]:
+                        break
+                elif fallback is None:
+                    fallback = entry.path
+    except FileNotFoundError:
+        return None
+
+    for name in PREFERRED_DATA_FILES:
+        if name in preferred_hits:
+            return Path(preferred_hits[name])
+    return Path(fallback) if fallback is not None else None
+
+
+SIGNATURE_FILE = Path("output/.sig")
+
+
+def export_signature(data_path):
+    """Fingerprint the export inputs: the data file plus the analysis and loader code."""
+    return input_fingerprint(data_path)
+
+
+def load_signatures():
+    """Return the {output file: signature} map from the last run."""
+    try:
+        return json.loads(SIGNATURE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+@lru_cache(maxsize=1)
+def build_parser():
+    """Build the command-line parser once; repeated main() calls reuse it."""
+    parser = argparse.ArgumentParser(description="California energy analysis by fuel type")
+    parser.add_argument("--skip-viz", action="store_true",
+                        help="skip rendering the stacked area PNG")
+    parser.add_argument("--force", action="store_true",
+                        help="re-export even if the outputs are up to date")
+    return parser
+
+
+def main(argv=None):
+    """Main function to run the fuel-based energy analysis.
+
+    Args:
+        argv (list): Command-line arguments; defaults to sys.argv[1:]
+    """
+    args = build_parser().parse_args(argv)
 
-def main():
-    """Main function to run the fuel-based energy analysis."""
     print("🔋 California Energy Analysis (2014-2024)")
     print("=" * 50)
 
     # Locate a data CSV automatically (prefer a fuel-based export if present)
-    data_dir = Path("data")
-    candidates = []
-    if data_dir.exists():
-        # Prefer common EIA naming that indicates net generation by fuel
-        preferred_names = [
-            "Net_generation_for_California.csv",
-            "eia_california_generation_annual.csv",
-        ]
-        for name in preferred_names:
-            p = data_dir / name
-            if p.exists():
-                candidates.append(p)
-        # Fallback: any CSV in data/
-        if not candidates:
-            candidates = sorted(data_dir.glob("*.csv"))
-
-    if not candidates:
+    data_path = find_data_csv("data")
+    if data_path is None:
         print("Error: No CSV data found in ./data")
         print("Place your EIA CSV export in the data/ folder and rerun.")
         return
 
-    data_path = candidates[0]
-
     # Create analyzer and run analysis
-    analyzer = CaliforniaEnergyAnalyzer(str(data_path))
+    analyzer = CaliforniaEnergyAnalyzer(str(data_path), memo_dir="output/.cache")
 
     print("\n📊 Loading and analyzing fuel data...")
     analyzer.load_data()
     analyzer.process_data()
     stats = analyzer.calculate_summary_statistics()
-    insights = analyzer.generate_insights()
-
-    # Show basic results
-    print("\n" + "=" * 50)
-    print("🔍 ANALYSIS RESULTS")
-    print("=" * 50)
-
-    print("\nOverall:")
-    print(f"  Total energy generated: {stats['overall']['total_generation_mwh']:,.0f} MWh")
-    print(f"  Years analyzed: {stats['overall']['years_analyzed']}")
-    print(f"  Growth rate: {stats['trends']['overall_growth_rate']:.1f}%")
-
-    print("\nTop energy categories:")
-    for category, cat_stats in list(stats['by_category'].items())[:3]:
-        print(f"  {category}: {cat_stats['total_generation']:,.0f} MWh")
-
-    print("\nKey insights:")
+    insights = analyzer.generate_insights(stats=stats)
+
+    # Show basic results, built up and written to stdout in one call
+    lines = [
+        "",
+        "=" * 50,
+        "🔍 ANALYSIS RESULTS",
+        "=" * 50,
+        "",
+        "Overall:",
+        f"  Total energy generated: {stats['overall']['total_generation_mwh']:,.0f} MWh",
+        f"  Years analyzed: {stats['overall']['years_analyzed']}",
+        f"  Growth rate: {stats['trends']['overall_growth_rate']:.1f}%",
+        "",
+        "Top energy categories:",
+    ]
+    for category, cat_stats in islice(stats['by_category'].items(), 3):
+        lines.append(f"  {category}: {cat_stats['total_generation']:,.0f} MWh")
+
+    lines += ["", "Key insights:"]
     for insight in insights['key_findings'][:3]:
-        print(f"  • {insight}")
+        lines.append(f"  • {insight}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
     # Save results and generate chart
     print("\n💾 Exporting results and generating chart...")
-    analyzer.export_results('json')
-    analyzer.export_results('csv')
-    analyzer.generate_stacked_area_png("output/energy_mix.png")
+    sig = export_signature(data_path)
+    # --force re-exports everything this run writes, but keeps the entries of
+    # outputs it skips (e.g. the PNG with --skip-viz)
+    signatures = load_signatures()
+
+    def is_current(output_file):
+        return not args.force and signatures.get(output_file) == sig and Path(output_file).exists()
+
+    # Data exports: write every stale format in one export_results() call
+    data_outputs = {
+        'json': "output/analysis_results.json",
+        'csv': "output/processed_data.csv",
+    }
+    stale = []
+    for output_format, output_file in data_outputs.items():
+        if is_current(output_file):
+            print(f"  {output_file} is up to date, skipping")
+        else:
+            stale.append(output_format)
+
+    png_file = "output/energy_mix.png"
+    render_png = not args.skip_viz and not is_current(png_file)
+    if not args.skip_viz and not render_png:
+        print(f"  {png_file} is up to date, skipping")
+
+    # Data exports and the PNG render write different files, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = {}
+        if stale:
+            futures[tuple(data_outputs[fmt] for fmt in stale)] = executor.submit(
+                analyzer.export_results, formats=tuple(stale)
+            )
+        if render_png:
+            futures[(png_file,)] = executor.submit(analyzer.generate_stacked_area_png, png_file)
+        for output_files, future in futures.items():
+            future.result()
+            for output_file in output_files:
+                signatures[output_file] = sig
+    SIGNATURE_FILE.write_text(json.dumps(signatures, indent=2))
 
     print("\n✅ Analysis complete! Check the 'output' folder for:")
     print("   • processed_data.csv - Clean fuel data by year")
     print("   • analysis_results.json - Complete statistical analysis")  
-    print("   • energy_mix.png - Corrected stacked area chart")
+    if not args.skip_viz:
+        print("   • energy_mix.png - Corrected stacked area chart")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,6 @@
+"""
+California Energy Analysis - analysis and visualization package.
+
+Importable from the repository root, e.g.
+``from src.analysis import CaliforniaEnergyAnalyzer``.
+"""
@@ -17,7 +17,114 @@ Author: California Energy Analysis Project
 import pandas as pd
 import numpy as np
 from pathlib import Path
+import hashlib
+import importlib.util
 import json
+import math
+import os
+import pickle
+import re
+import tempfile
+import warnings
+
+try:
+    from . import io_eia
+    from .io_eia import load_eia_wide
+except ImportError:  # run as a script: python src/analysis.py
+    import io_eia
+    from io_eia import load_eia_wide
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is used without it
+    orjson = None
+
+
+# Clean fuel name rules in priority order: the first rule with any matching
+# substring wins, as in a cascade of `substring in name` tests
+_FUEL_RULES = (
+    ("All Fuels (Utility-Scale)", ("all fuels (utility-scale)",)),
+    # Solar hierarchy: collapse to one parent
+    ("All Utility-Scale Solar", ("all utility-scale solar", "utility-scale photovoltaic",
+                                 "photovoltaic", "solar thermal", "all solar")),
+    ("Natural Gas", ("natural gas",)),
+    ("Coal", ("coal",)),
+    ("Nuclear", ("nuclear",)),
+    ("Other Renewables", ("other renewables",)),
+    ("Hydroelectric", ("conventional hydroelectric",)),
+    ("Other Gases", ("other gases",)),
+    ("Petroleum Liquids", ("petroleum liquids",)),
+    ("Petroleum Coke", ("petroleum coke",)),
+)
+
+# One anchored alternation of lookaheads: alternatives are tried in rule
+# order, so priority is kept while the scanning happens inside the regex engine
+_FUEL_RE = re.compile("|".join(
+    "(?=.*?(%s))" % "|".join(map(re.escape, substrings)) for _, substrings in _FUEL_RULES
+))
+
+
+def _c_contiguous(frame, dtype=np.float64):
+    """Return a copy of a numeric frame backed by one C-contiguous array of dtype.
+
+    A transposed frame is Fortran-ordered; rebuilding it once keeps the
+    row and column reductions on the wide matrix on packed buffers.
+    """
+    # Always a fresh, writable buffer: to_numpy() can hand back a read-only
+    # view of frame, e.g. of the loader's cached matrix
+    values = np.array(frame.to_numpy(dtype=dtype), dtype=dtype, order='C', copy=True)
+    return pd.DataFrame(values, index=frame.index, columns=frame.columns, copy=False)
+
+
+def input_fingerprint(data_path, *extra):
+    """Fingerprint a run's inputs: the data file plus the analysis and loader code.
+
+    Built from each file's mtime and size (nothing is read), followed by any
+    extra values such as the storage dtype. Keys the Parquet cache, the
+    on-disk memos and main.py's export signatures.
+    """
+    parts = []
+    for path in (data_path, __file__, io_eia.__file__):
+        st = Path(path).stat()
+        parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+    parts.extend(str(value) for value in extra)
+    return hashlib.blake2b(":".join(parts).encode(), digest_size=8).hexdigest()
+
+
+def _write_atomic(path, write):
+    """Call write(tmp_path) on a temp file beside path, then move it into place.
+
+    Readers never see a partially written file; the temp file is removed if
+    writing fails.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    # mkstemp creates files private to the user; give them the usual mode
+    os.chmod(path, 0o644)
+
+
+def _to_builtin(obj):
+    """Recursively convert NumPy scalars and arrays (values and dict keys) to plain Python for json.
+
+    NaN and infinite floats become None, so every encoder writes null.
+    """
+    if isinstance(obj, dict):
+        return {_to_builtin(key): _to_builtin(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        return [_to_builtin(value) for value in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
 
 
 class CaliforniaEnergyAnalyzer:
@@ -28,125 +135,262 @@ class CaliforniaEnergyAnalyzer:
     and visualization generation for California's energy transition analysis.
     """
 
-    def __init__(self, data_path="data/eia_california_generation_annual.csv"):
+    def __init__(self, data_path="data/eia_california_generation_annual.csv", dtype=np.float64,
+                 memo_dir=None):
         """
         Initialize the analyzer.
 
         Args:
             data_path (str): Path to the data file
+            dtype: Float dtype of the loaded matrix. np.float32 halves memory
+                traffic; sums and shares may then differ in the last digits
+            memo_dir (str): Directory for on-disk memos of process_data() and
+                calculate_summary_statistics() (e.g. "output/.cache"); off by default
         """
         self.data_path = Path(data_path)
+        self.dtype = np.dtype(dtype)
+        self.memo_dir = Path(memo_dir) if memo_dir is not None else None
+        self._memo_key = None
         self.raw_data = None
+        # The matrix last read from data_path; on-disk memos only apply to it
+        self._loaded_raw = None
         self.processed_data = None
+        self.yearly_totals = None
+        self.generation_wide = None
+        # Clean fuel name per processed_data row (see _clean_fuel_column)
+        self._clean_fuel = None
+        self._clean_fuel_source = None
+        # Per-category aggregate of processed_data, built on first use
+        self._cat_group = None
         self.analysis_results = {}
+        self._clean_fuel_cache = {}
+        # Inputs the cached processed data/statistics/insights were computed from
+        self._processed_source = None
+        self._stats_source = None
+        self._insights_source = None
 
-    def load_data(self):
+    def load_data(self, use_cache=True):
         """
         Load the raw EIA data from CSV file.
 
         Supports both older EIA CSV exports and the newer format where the
         header row contains years starting at column index 3, followed by
         rows where column 0 is the category (fuel type) and columns >=3 are values.
+
+        When pyarrow is available the parsed matrix is cached as Parquet
+        (see cache_path()) and later calls read the cache instead of the CSV;
+        a cache that cannot be read is deleted and the CSV is parsed again.
+
+        Args:
+            use_cache (bool): Read and write the Parquet cache
         """
+        cache_path = None
+        if use_cache and importlib.util.find_spec("pyarrow") is not None:
+            import pyarrow as pa
+            cache_path = self.cache_path()
+            if cache_path.exists():
+                try:
+                    return self.load_cached(cache_path)
+                except (OSError, KeyError, ValueError, pa.ArrowException) as e:
+                    # Unreadable cache (e.g. truncated): drop it and re-parse the CSV
+                    print(f"  Warning: ignoring unreadable cache {cache_path}: {e}")
+                    try:
+                        cache_path.unlink()
+                    except OSError:
+                        pass
+
         print("Loading California energy data...")
 
-        # Find header line index by scanning raw text (robust to metadata lines)
-        header_idx = None
-        with open(self.data_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        for i, line in enumerate(lines):
-            if '"description"' in line and '"units"' in line and '"source key"' in line:
-                header_idx = i
-                break
-
-        if header_idx is None:
-            print("Error: Could not find header row with description/units/source key")
+        try:
+            df_data = load_eia_wide(self.data_path)
+        except ValueError as e:
+            print(f"Error: {e}")
             return None
 
-        # Read again with the detected header row
-        df_full = pd.read_csv(self.data_path, header=header_idx, engine='python')
-
-        # Identify year columns (numeric column names)
-        year_cols = []
-        for col in df_full.columns:
+        self.raw_data = self._loaded_raw = df_data = _c_contiguous(df_data, self.dtype)
+        self._memo_key = None
+        print(f"Loaded data: {df_data.shape[0]} years, {df_data.shape[1]} categories")
+        if cache_path is not None:
             try:
-                if str(col).strip().isdigit():
-                    year_cols.append(int(str(col).strip()))
-            except Exception:
-                continue
+                self.save_cache(cache_path)
+            except (OSError, pa.ArrowException) as e:
+                # A read-only data/ directory just means no cache
+                print(f"  Warning: could not write cache {cache_path}: {e}")
+        return df_data
 
-        if not year_cols:
-            print("Error: No year columns found in CSV header")
-            return None
+    def cache_path(self):
+        """
+        Return the Parquet cache path for the data file.
 
-        # Build matrix: rows = years, columns = fuel categories (from description)
-        categories = []
-        data_rows = []
-        for _, row in df_full.iterrows():
-            desc = str(row.get('description', '')).strip()
-            if not desc:
-                continue
-            values = []
-            non_zero = False
-            for y in year_cols:
-                val = row.get(str(y), None)
-                try:
-                    num = float(val)
-                except Exception:
-                    num = 0.0
-                if num != 0.0:
-                    non_zero = True
-                values.append(num)
-            if non_zero:
-                categories.append(desc)
-                data_rows.append(values)
-
-        df_data = pd.DataFrame(data_rows, columns=year_cols)
-        df_data['Category'] = categories
-        df_data = df_data.set_index('Category').T
+        The name is keyed by the mtime and size of the file and of the
+        analysis and loader source, and by the storage dtype, so an edited
+        CSV, a parser change or a different dtype never reads a stale cache.
+        """
+        digest = input_fingerprint(self.data_path, self.dtype)
+        return self.data_path.parent / ".cache" / f"{self.data_path.stem}-{digest}.parquet"
+
+    def load_cached(self, cache_path):
+        """
+        Load the raw Year x Category matrix from a Parquet cache.
+
+        The cache must have been written by save_cache(); this skips the CSV
+        header scan and parse entirely.
+
+        Args:
+            cache_path (str): Path to the Parquet cache file
+        """
+        print("Loading California energy data (cached)...")
+
+        # Stored category-major so duplicate category names survive the round trip
+        cached = pd.read_parquet(cache_path, engine='pyarrow')
+        df_data = cached.set_index('Category').T
+        df_data.index = df_data.index.astype(int)
         df_data.index.name = 'Year'
 
-        self.raw_data = df_data
+        self.raw_data = self._loaded_raw = df_data = _c_contiguous(df_data, self.dtype)
+        self._memo_key = None
         print(f"Loaded data: {df_data.shape[0]} years, {df_data.shape[1]} categories")
         return df_data
 
+    def save_cache(self, cache_path):
+        """
+        Write the raw Year x Category matrix to a Parquet cache.
+
+        Args:
+            cache_path (str): Destination path for the Parquet file
+        """
+        cached = self.raw_data.T.rename(columns=str).reset_index()
+        # Written atomically, so an interrupted run cannot leave a truncated cache
+        _write_atomic(cache_path, lambda tmp_path: cached.to_parquet(
+            tmp_path, engine='pyarrow', compression='zstd', index=False
+        ))
+
+    def _memo_path(self, stage):
+        """
+        Return the on-disk memo file for a pipeline stage.
+
+        Keyed by input_fingerprint() of the data file and code, the storage
+        dtype and the pandas/NumPy versions (the memos are pickles), so any
+        of those changing misses the memo.
+        """
+        if self._memo_key is None:
+            self._memo_key = input_fingerprint(self.data_path, self.dtype, pd.__version__, np.__version__)
+        return self.memo_dir / f"{self.data_path.stem}-{self._memo_key}-{stage}.pkl"
+
+    def _use_memo(self):
+        """Whether on-disk memos apply: enabled, and raw_data is the matrix read from data_path."""
+        return self.memo_dir is not None and self.raw_data is not None and self.raw_data is self._loaded_raw
+
+    def _load_memo(self, stage):
+        """Return the memoized result of a stage, or None if absent or unreadable."""
+        try:
+            with open(self._memo_path(stage), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _save_memo(self, stage, result):
+        """Persist a stage result for later runs on the same data and code."""
+        def write(tmp_path):
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Written atomically, so an interrupted run cannot leave a partial memo
+        memo_path = self._memo_path(stage)
+        _write_atomic(memo_path, write)
+
+        # Drop this stage's memos for older data, code or library versions
+        for stale in memo_path.parent.glob(f"{self.data_path.stem}-{'?' * 16}-{stage}.pkl"):
+            if stale != memo_path:
+                stale.unlink(missing_ok=True)
+
     def process_data(self):
         """
         Process raw data into analysis-ready format.
+
+        Totals and shares are computed on the wide Year x Category matrix
+        (kept as generation_wide); the long processed_data frame is then a
+        reshape of those, with no groupby or per-row lookup.
+        The result is cached and returned again until raw_data changes.
         """
         if self.raw_data is None:
             self.load_data()
 
+        if self._processed_source is self.raw_data and self.processed_data is not None:
+            return self.processed_data
+
+        use_memo = self._use_memo()
+        memo = self._load_memo('processed') if use_memo else None
+        if memo is not None:
+            print("Processing data (cached)...")
+            for name, value in memo.items():
+                setattr(self, name, value)
+            self._cat_group = None
+            self._processed_source = self.raw_data
+            print(f"Processed {len(self.processed_data)} data points")
+            return self.processed_data
+
         print("Processing data...")
 
-        # Convert to long format
-        processed = self.raw_data.reset_index().melt(
+        # load_data()/load_cached() hand over self.dtype values with int years;
+        # only coerce a matrix that was supplied some other way
+        generation = self.raw_data
+        if not (generation.dtypes == self.dtype).all():
+            generation = generation.apply(pd.to_numeric, errors='coerce').fillna(0.0).astype(self.dtype)
+        if generation.index.dtype.kind != 'i':
+            generation = generation.set_axis(generation.index.astype(int), axis=0)
+
+        # Compute shares by broadcasting
+        yearly_totals = generation.sum(axis=1)
+        pct = generation.div(yearly_totals, axis=0) * 100
+
+        # Convert to long format (melt is column-major: every year of a category in turn)
+        processed = generation.reset_index().melt(
             id_vars=['Year'],
             var_name='Category',
             value_name='Generation_MWh'
         )
-
-        # Convert year to integer
-        processed['Year'] = processed['Year'].astype(int)
-        # Ensure numeric and fill missing
-        processed['Generation_MWh'] = pd.to_numeric(processed['Generation_MWh'], errors='coerce').fillna(0.0)
-
-        # Calculate yearly totals
-        yearly_totals = processed.groupby('Year')['Generation_MWh'].sum()
-        processed['Total_Yearly_Generation'] = processed['Year'].map(yearly_totals)
-        processed['Percentage'] = (processed['Generation_MWh'] / processed['Total_Yearly_Generation']) * 100
-
+        processed['Total_Yearly_Generation'] = np.tile(yearly_totals.to_numpy(), generation.shape[1])
+        processed['Percentage'] = pct.to_numpy().ravel(order='F')
+        # Low-cardinality grouping key: integer codes instead of hashing strings
+        processed['Category'] = processed['Category'].astype('category')
+        # Calendar years fit comfortably in int16
+        processed['Year'] = processed['Year'].astype('int16')
+
+        self.generation_wide = generation
         self.processed_data = processed
+        self.yearly_totals = yearly_totals
+        self._cat_group = None
+        self._processed_source = self.raw_data
+        if use_memo:
+            self._save_memo('processed', {
+                'generation_wide': generation,
+                'processed_data': processed,
+                'yearly_totals': yearly_totals,
+            })
         print(f"Processed {len(processed)} data points")
         return processed
 
     def calculate_summary_statistics(self):
         """
         Calculate basic summary statistics.
+
+        The result is cached and returned again until processed_data changes.
         """
         if self.processed_data is None:
             self.process_data()
 
+        if self._stats_source is self.processed_data and 'statistics' in self.analysis_results:
+            return self.analysis_results['statistics']
+
+        # The on-disk memo only matches processed_data built from the file's matrix
+        use_memo = self._use_memo() and self._processed_source is self.raw_data
+        stats = self._load_memo('statistics') if use_memo else None
+        if stats is not None:
+            self.analysis_results['statistics'] = stats
+            self._stats_source = self.processed_data
+            return stats
+
         print("Calculating statistics...")
 
         stats = {
@@ -165,41 +409,32 @@ class CaliforniaEnergyAnalyzer:
             'years_analyzed': years_count,
             'categories_tracked': categories_count,
             'avg_yearly_generation': total_generation / years_count,
-            'peak_year': int(self.processed_data.groupby('Year')['Generation_MWh'].sum().idxmax()),
-            'lowest_year': int(self.processed_data.groupby('Year')['Generation_MWh'].sum().idxmin())
+            'peak_year': int(self.yearly_totals.idxmax()),
+            'lowest_year': int(self.yearly_totals.idxmin())
         }
 
-        # Per-category statistics
-        for category in self.processed_data['Category'].unique():
-            cat_data = self.processed_data[self.processed_data['Category'] == category].copy()
-            # drop rows where both year or value are missing
-            cat_data = cat_data.dropna(subset=['Year', 'Generation_MWh'])
-            if cat_data.empty:
-                continue
-            total_gen = cat_data['Generation_MWh'].sum()
-            if total_gen == 0:
-                continue
-            # robust peak/lowest year lookup
-            peak_idx = cat_data['Generation_MWh'].idxmax()
-            low_idx = cat_data['Generation_MWh'].idxmin()
-            peak_year_val = int(cat_data.loc[peak_idx, 'Year'])
-            low_year_val = int(cat_data.loc[low_idx, 'Year'])
-
-            cat_stats = {
-                'total_generation': total_gen,
-                'average_yearly': cat_data['Generation_MWh'].mean(),
-                'peak_year': peak_year_val,
-                'lowest_year': low_year_val,
-                'volatility': cat_data['Generation_MWh'].std(),
-                'growth_rate': self._calculate_growth_rate(cat_data)
-            }
-            stats['by_category'][category] = cat_stats
+        # Per-category statistics: one grouped pass instead of a filter per category
+        cat_agg = self._cat_agg()
+        # Categories that never generated anything are left out
+        cat_agg = cat_agg[cat_agg['total_generation'] != 0]
+        # Peak/lowest years come from the same pooled pass as the totals, so
+        # repeated EIA rows are treated alike by every per-category statistic
+        years = self.processed_data['Year']
+        cat_agg['peak_year'] = years.loc[cat_agg['peak_row']].to_numpy()
+        cat_agg['lowest_year'] = years.loc[cat_agg['low_row']].to_numpy()
+        cat_agg['growth_rate'] = self._calculate_growth_rate(
+            cat_agg['first'], cat_agg['last'], cat_agg['periods']
+        )
+
+        stat_cols = ['total_generation', 'average_yearly', 'peak_year',
+                     'lowest_year', 'volatility', 'growth_rate']
+        stats['by_category'] = cat_agg[stat_cols].to_dict('index')
 
         # Simple trend analysis
         first_year = self.processed_data['Year'].min()
         last_year = self.processed_data['Year'].max()
 
-        overall_growth = ((self.raw_data.loc[last_year].sum() / self.raw_data.loc[first_year].sum()) - 1) * 100
+        overall_growth = ((self.generation_wide.loc[last_year].sum() / self.generation_wide.loc[first_year].sum()) - 1) * 100
 
         stats['trends'] = {
             'overall_growth_rate': overall_growth,
@@ -209,18 +444,29 @@ class CaliforniaEnergyAnalyzer:
         }
 
         self.analysis_results['statistics'] = stats
+        self._stats_source = self.processed_data
+        if use_memo:
+            self._save_memo('statistics', stats)
         return stats
 
-    def generate_insights(self):
+    def generate_insights(self, stats=None):
         """
         Generate basic insights from the data.
+
+        The result is cached and returned again for the same stats.
+
+        Args:
+            stats (dict): Result of calculate_summary_statistics(); computed
+                (or taken from the cache) when omitted
         """
-        if 'statistics' not in self.analysis_results:
-            self.calculate_summary_statistics()
+        if stats is None:
+            stats = self.calculate_summary_statistics()
+
+        if self._insights_source is stats and 'insights' in self.analysis_results:
+            return self.analysis_results['insights']
 
         print("Generating insights...")
 
-        stats = self.analysis_results['statistics']
         insights = {
             'key_findings': [],
             'notable_trends': [],
@@ -231,7 +477,7 @@ class CaliforniaEnergyAnalyzer:
         # Simple key findings (fuel-focused, data-driven)
         dominant = stats['trends']['dominant_category']
         peak_year = stats['overall']['peak_year']
-        peak_val = self.raw_data.loc[peak_year].sum()
+        peak_val = self.yearly_totals.loc[peak_year]
 
         insights['key_findings'] = [
             f"Net generation grew {stats['trends']['overall_growth_rate']:.1f}% from {stats['trends']['period']}",
@@ -257,16 +503,9 @@ class CaliforniaEnergyAnalyzer:
             })
 
         # Notable trends (computed): top growth, top decline, most volatile
-        by_growth = sorted(
-            ((c, v['growth_rate']) for c, v in stats['by_category'].items()),
-            key=lambda x: x[1], reverse=True
-        )
-        top_grow = by_growth[0] if by_growth else (None, 0)
-        by_decline = sorted(
-            ((c, v['growth_rate']) for c, v in stats['by_category'].items()),
-            key=lambda x: x[1]
-        )
-        top_decline = by_decline[0] if by_decline else (None, 0)
+        growth = [(c, v['growth_rate']) for c, v in stats['by_category'].items()]
+        top_grow = max(growth, key=lambda x: x[1], default=(None, 0))
+        top_decline = min(growth, key=lambda x: x[1], default=(None, 0))
 
         insights['notable_trends'] = []
         if top_grow[0] is not None:
@@ -282,51 +521,143 @@ class CaliforniaEnergyAnalyzer:
         )
 
         self.analysis_results['insights'] = insights
+        self._insights_source = stats
         return insights
 
-    def _calculate_growth_rate(self, category_data):
-        """Calculate simple growth rate for a category over the period."""
-        first_value = category_data['Generation_MWh'].iloc[0]
-        last_value = category_data['Generation_MWh'].iloc[-1]
-        years = len(category_data)
+    @staticmethod
+    def _calculate_growth_rate(first, last, periods):
+        """Calculate simple growth rates (%) elementwise from first/last values.
 
-        if first_value > 0 and years > 1:
-            return ((last_value / first_value) ** (1 / (years - 1)) - 1) * 100
-        return 0.0
+        Returns 0.0 where the first value is not positive or there is only one period.
+        """
+        # Evaluate in float64 even when the data is stored as float32
+        first = first.astype(np.float64)
+        last = last.astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # exp(log(r) / n) - 1 == r ** (1 / n) - 1, as one vectorized log/expm1
+            rate = np.expm1(np.log(last / first) / (periods - 1)) * 100
+        return rate.where((first > 0) & (periods > 1), 0.0)
+
+    def _cat_agg(self):
+        """Return the per-category aggregate of processed_data (cached).
+
+        One grouped pass feeds both the by_category statistics and
+        _find_most_volatile_category(); process_data() resets the cache.
+        """
+        if self._cat_group is None:
+            grouped = self.processed_data.groupby('Category', observed=True, sort=False)['Generation_MWh']
+            self._cat_group = grouped.agg(
+                total_generation='sum',
+                average_yearly='mean',
+                volatility='std',
+                first='first',
+                last='last',
+                periods='size',
+                peak_row='idxmax',
+                low_row='idxmin',
+            )
+        return self._cat_group
 
     def _find_dominant_category(self):
         """Find the category with highest average share."""
-        avg_percentages = self.processed_data.groupby('Category')['Percentage'].mean()
-        return avg_percentages.idxmax()
+        return self.generation_wide.div(self.yearly_totals, axis=0).mean(axis=0).idxmax()
 
     def _find_most_volatile_category(self):
         """Find the category with highest volatility."""
-        volatility = self.processed_data.groupby('Category')['Generation_MWh'].std()
-        return volatility.idxmax()
+        # Long-frame aggregate on purpose: repeated EIA rows pool into one
+        # category, so this matches the volatility reported in by_category
+        return self._cat_agg()['volatility'].idxmax()
 
-    def export_results(self, output_format='json'):
+    def export_results(self, formats=('json',), output_format=None):
         """
         Export analysis results to file.
-        """
-        if not self.analysis_results:
-            self.generate_insights()
 
-        print(f"Exporting results as {output_format.upper()}...")
+        Args:
+            formats (tuple): Output formats to write, any of 'json', 'csv' and
+                'parquet' (needs pyarrow). A single format string is also accepted.
+            output_format (str): Deprecated alias for formats=(output_format,)
+        """
+        if output_format is not None:
+            warnings.warn(
+                "export_results(output_format=...) is deprecated; use formats=(...) instead",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            formats = (output_format,)
+        if isinstance(formats, str):
+            formats = (formats,)
 
-        if output_format.lower() == 'json':
-            output_file = "output/analysis_results.json"
-            with open(output_file, 'w') as f:
-                json.dump(self.analysis_results, f, indent=2, default=str)
-            print(f"  Results exported to {output_file}")
+        if 'insights' not in self.analysis_results:
+            self.generate_insights()
 
-        elif output_format.lower() == 'csv':
-            # Export processed data
-            output_file = "output/processed_data.csv"
-            self.processed_data.to_csv(output_file, index=False)
-            print(f"  Data exported to {output_file}")
+        for output_format in formats:
+            print(f"Exporting results as {output_format.upper()}...")
+
+            if output_format.lower() == 'json':
+                output_file = "output/analysis_results.json"
+                # NumPy keys (e.g. int64 years) are rejected by both encoders; convert first
+                results = _to_builtin(self.analysis_results)
+                if orjson is not None:
+                    payload = orjson.dumps(
+                        results,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    )
+                    Path(output_file).write_bytes(payload)
+                else:
+                    with open(output_file, 'w') as f:
+                        json.dump(results, f, indent=2, allow_nan=False)
+                print(f"  Results exported to {output_file}")
+
+            elif output_format.lower() == 'csv':
+                # Export processed data
+                output_file = "output/processed_data.csv"
+                if importlib.util.find_spec("pyarrow") is not None:
+                    # Multi-threaded C++ writer straight from Arrow buffers
+                    import pyarrow as pa
+                    import pyarrow.csv as pa_csv
+                    table = pa.Table.from_pandas(self.processed_data, preserve_index=False)
+                    pa_csv.write_csv(table, output_file)
+                else:
+                    self.processed_data.to_csv(output_file, index=False)
+                print(f"  Data exported to {output_file}")
+
+            elif output_format.lower() == 'parquet':
+                # Typed, columnar copy of processed data (keeps the category/int16 dtypes)
+                output_file = "output/processed_data.parquet"
+                if importlib.util.find_spec("pyarrow") is None:
+                    print("  Warning: pyarrow is not installed; skipping Parquet export")
+                    continue
+                self.processed_data.to_parquet(output_file, engine='pyarrow', compression='zstd', index=False)
+                print(f"  Data exported to {output_file}")
 
     # ---------- Helper methods for cleaned fuel view and chart ----------
     def _clean_fuel_name(self, raw: str) -> str:
+        """Return the clean fuel name for a raw EIA description (memoized)."""
+        if raw not in self._clean_fuel_cache:
+            self._clean_fuel_cache[raw] = self._map_fuel_name(raw)
+        return self._clean_fuel_cache[raw]
+
+    def _clean_fuel_names(self, categories: pd.Series) -> pd.Series:
+        """Map a column of raw categories to clean fuel names.
+
+        The name heuristics run once per unique category, not once per row.
+        """
+        mapping = {raw: self._clean_fuel_name(raw) for raw in categories.unique()}
+        return categories.map(mapping)
+
+    def _clean_fuel_column(self) -> pd.Series:
+        """Return the clean fuel name of every processed_data row (cached).
+
+        Derived from the current processed_data and rebuilt when that frame
+        is replaced; kept beside it so the CSV export is unchanged.
+        """
+        if self._clean_fuel is None or self._clean_fuel_source is not self.processed_data:
+            self._clean_fuel = self._clean_fuel_names(self.processed_data['Category']).astype('category')
+            self._clean_fuel_source = self.processed_data
+        return self._clean_fuel
+
+    @staticmethod
+    def _map_fuel_name(raw: str) -> str:
         """Map raw EIA description strings to cleaner parent fuel names.
 
         Heuristics:
@@ -339,34 +670,9 @@ class CaliforniaEnergyAnalyzer:
         if name.lower().startswith("all sectors : "):
             name = name[len("all sectors : ") :].strip()
 
-        lower = name.lower()
-        if "all fuels (utility-scale)" in lower:
-            return "All Fuels (Utility-Scale)"
-
-        # Solar hierarchy: collapse to one parent
-        if "all utility-scale solar" in lower:
-            return "All Utility-Scale Solar"
-        if "utility-scale photovoltaic" in lower or "photovoltaic" in lower:
-            return "All Utility-Scale Solar"
-        if "solar thermal" in lower:
-            return "All Utility-Scale Solar"
-        if "all solar" in lower:
-            return "All Utility-Scale Solar"
-
-        # Make common fuels nicer
-        mapping = {
-            "natural gas": "Natural Gas",
-            "coal": "Coal",
-            "nuclear": "Nuclear",
-            "other renewables": "Other Renewables",
-            "conventional hydroelectric": "Hydroelectric",
-            "other gases": "Other Gases",
-            "petroleum liquids": "Petroleum Liquids",
-            "petroleum coke": "Petroleum Coke",
-        }
-        for key, val in mapping.items():
-            if key in lower:
-                return val
+        match = _FUEL_RE.match(name.lower())
+        if match:
+            return _FUEL_RULES[match.lastindex - 1][0]
         # Fallback: basic cleanup/case
         return name.replace("  ", " ").strip().title()
 
@@ -378,55 +684,51 @@ class CaliforniaEnergyAnalyzer:
         if self.processed_data is None:
             self.process_data()
 
-        df = self.processed_data.copy()
-        df["CleanFuel"] = df["Category"].apply(self._clean_fuel_name)
-
-        # Aggregate per year per clean fuel to avoid double counting within a year
+        # Aggregate per year per clean fuel to avoid double counting within a year;
+        # assign() adds the key without deep-copying processed_data
         yearly = (
-            df.groupby(["Year", "CleanFuel"], as_index=False)["Generation_MWh"].sum()
+            self.processed_data.assign(CleanFuel=self._clean_fuel_column())
+            .groupby(["Year", "CleanFuel"], as_index=False, observed=True, sort=False)["Generation_MWh"].sum()
         )
 
         # Totals over period
-        totals = yearly.groupby("CleanFuel")["Generation_MWh"].sum().rename("Total_MWh")
-
-        # Build simple growth per fuel
-        growth_list = {}
-        for fuel, grp in yearly.groupby("CleanFuel"):
-            grp_sorted = grp.sort_values("Year")
-            first = grp_sorted["Generation_MWh"].iloc[0]
-            last = grp_sorted["Generation_MWh"].iloc[-1]
-            years = len(grp_sorted)
-            if first > 0 and years > 1:
-                gr = ((last / first) ** (1 / (years - 1)) - 1) * 100
-            else:
-                gr = 0.0
-            growth_list[fuel] = gr
+        totals = yearly.groupby("CleanFuel", observed=True, sort=False)["Generation_MWh"].sum().rename("Total_MWh")
+
+        # Growth per fuel in one vectorized pass over the Year x Fuel matrix
+        pivot = yearly.pivot(index="Year", columns="CleanFuel", values="Generation_MWh").sort_index()
+        growth = self._calculate_growth_rate(pivot.iloc[0], pivot.iloc[-1], pivot.count())
 
         out = (
             totals.to_frame()
-            .assign(Growth_Percent=lambda s: s.index.map(lambda k: growth_list.get(k, 0.0)))
+            .assign(Growth_Percent=growth.reindex(totals.index, fill_value=0.0))
             .reset_index()
             .rename(columns={"CleanFuel": "Fuel"})
             .sort_values("Total_MWh", ascending=False)
         )
         return out
 
-    def generate_stacked_area_png(self, output_path: str = "output/energy_mix.png") -> None:
-        """Create a stacked area chart of generation by cleaned fuel and save PNG."""
-        import matplotlib.pyplot as plt
+    def generate_stacked_area_png(self, output_path: str = "output/energy_mix.png", fast: bool = False) -> None:
+        """Create a stacked area chart of generation by cleaned fuel and save PNG.
+
+        With fast=True the chart is drawn on a smaller canvas at 100 dpi and
+        saved without the tight-bbox pass, for quick previews.
+        """
+        # An explicit Figure renders with Agg and leaves pyplot's global
+        # backend and figure registry alone
+        import matplotlib
+        from matplotlib.figure import Figure
 
         if self.processed_data is None:
             self.process_data()
 
-        df = self.processed_data.copy()
-        df["CleanFuel"] = df["Category"].apply(self._clean_fuel_name)
+        clean = self._clean_fuel_column()
 
         # CRITICAL: Remove aggregate totals to avoid stacking total with parts
-        df_fuels = df[df["CleanFuel"] != "All Fuels (Utility-Scale)"].copy()
+        df_fuels = self.processed_data.assign(CleanFuel=clean)[clean != "All Fuels (Utility-Scale)"]
         
         # Pivot to Year x Fuel matrix (MWh) - individual fuels only
         pivot = (
-            df_fuels.groupby(["Year", "CleanFuel"])['Generation_MWh']
+            df_fuels.groupby(["Year", "CleanFuel"], observed=True, sort=False)['Generation_MWh']
               .sum()
               .unstack(fill_value=0)
               .sort_index()
@@ -439,21 +741,34 @@ class CaliforniaEnergyAnalyzer:
         if len(totals) > len(keep):
             plot_df["Other"] = pivot.drop(columns=keep, errors='ignore').sum(axis=1)
 
-        plt.figure(figsize=(12, 7))
-        ax = plot_df.plot.area(colormap='tab10', alpha=0.8)
-        plt.ylabel("Generation (Thousand MWh)")
-        plt.xlabel("Year")
-        plt.title("California Energy Mix by Fuel Type (2014–2024)")
-        plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.tight_layout()
+        # Stack once up front: row i of `stacked` is the upper edge of fuel i
+        years = plot_df.index.to_numpy()
+        labels = plot_df.columns.tolist()
+        stacked = np.cumsum(plot_df.to_numpy(dtype=np.float32).T, axis=0)
+        colors = matplotlib.colormaps['tab10'](np.linspace(0, 1, len(labels)))
+
+        fig = Figure(figsize=(10, 6) if fast else (12, 7))
+        ax = fig.subplots()
+        for i, label in enumerate(labels):
+            lower = stacked[i - 1] if i else 0.0
+            ax.fill_between(years, lower, stacked[i], color=colors[i], alpha=0.8, label=label)
+        ax.set_xlim(years[0], years[-1])
+        ax.set_ylim(bottom=0)
+        ax.set_ylabel("Generation (Thousand MWh)")
+        ax.set_xlabel("Year")
+        ax.set_title("California Energy Mix by Fuel Type (2014–2024)")
+        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        fig.tight_layout()
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(output_path, dpi=160, bbox_inches='tight')
-        plt.close()
+        if fast:
+            fig.savefig(output_path, dpi=100)
+        else:
+            fig.savefig(output_path, dpi=160, bbox_inches='tight')
         print(f"  Stacked area chart saved to {output_path}")
 
     def print_analysis_summary(self):
         """Print a simple summary of the analysis."""
-        if not self.analysis_results:
+        if 'insights' not in self.analysis_results:
             self.generate_insights()
 
         print("\n" + "="*60)
@@ -499,8 +814,7 @@ def main():
     analyzer.print_analysis_summary()
 
     # Export results
-    analyzer.export_results('json')
-    analyzer.export_results('csv')
+    analyzer.export_results(formats=('json', 'csv'))
 
     print("\nAnalysis complete! Check 'output' directory for exported files.")
 
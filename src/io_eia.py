@@ -0,0 +1,94 @@
+"""
+California Energy Analysis - EIA CSV Loader
+
+Shared parser for EIA Electricity Data Browser CSV exports, used by both the
+analysis and the visualization modules so a file is parsed once per run.
+
+Author: California Energy Analysis Project
+"""
+
+import csv
+import importlib.util
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+
+def _csv_engine():
+    """Return the fastest available pandas CSV engine for the EIA export."""
+    # PyArrow's reader is multi-threaded; pandas' C engine is the fallback
+    if importlib.util.find_spec("pyarrow") is not None:
+        return 'pyarrow'
+    return 'c'
+
+
+def load_eia_wide(path):
+    """
+    Parse an EIA CSV export into a Year x Category matrix.
+
+    Results are cached per (path, mtime, size), so repeated calls for an
+    unchanged file return the same frame without re-reading it; callers
+    must treat it as read-only.
+
+    Args:
+        path (str): Path to the EIA CSV file
+
+    Returns:
+        pd.DataFrame: Rows indexed by int Year, one column per category
+
+    Raises:
+        ValueError: If the header row or the year columns cannot be found
+    """
+    path = Path(path)
+    st = path.stat()
+    return _load_eia_wide(str(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=4)
+def _load_eia_wide(path, mtime_ns, size):
+    """Parse the CSV at path; mtime_ns and size only key the cache."""
+    # Find header line index by scanning raw text (robust to metadata lines);
+    # stop reading at the header instead of slurping the whole file
+    header_idx = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for i, line in enumerate(f):
+            if '"description"' in line and '"units"' in line and '"source key"' in line:
+                header_idx = i
+                header_fields = next(csv.reader([line]))
+                break
+
+    if header_idx is None:
+        raise ValueError("Could not find header row with description/units/source key")
+
+    # Identify year columns (numeric column names) from the header line itself
+    year_labels = [col for col in header_fields if col.strip().isdigit()]
+    year_cols = [int(col.strip()) for col in year_labels]
+
+    if not year_cols:
+        raise ValueError("No year columns found in CSV header")
+
+    # Read again with the detected header row (lines above it are skipped),
+    # parsing only the description and year columns
+    df_full = pd.read_csv(
+        path,
+        header=header_idx,
+        usecols=['description'] + year_labels,
+        engine=_csv_engine(),
+    )
+
+    # Convert the whole year block at once; placeholders such as "--" become NaN
+    raw_block = df_full[year_labels]
+    block = raw_block.apply(pd.to_numeric, errors='coerce')
+
+    # Keep described rows with any non-zero cell. Blank cells count as
+    # non-zero here, matching the old per-cell float() check.
+    desc = df_full['description'].astype(str).str.strip()
+    has_value = (raw_block.isna() | block.fillna(0.0).ne(0.0)).any(axis=1)
+    keep = desc.ne('') & has_value
+
+    # Build matrix: rows = years, columns = fuel categories (from description)
+    df_data = block.loc[keep].fillna(0.0).T
+    df_data.index = pd.Index(year_cols, name='Year')
+    df_data.columns = pd.Index(desc[keep], name='Category')
+    return df_data
@@ -12,8 +12,14 @@ import pandas as pd
 import altair as alt
 import matplotlib.pyplot as plt
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    from .io_eia import load_eia_wide
+except ImportError:  # run as a script: python src/visualization.py
+    from io_eia import load_eia_wide
+
 # Enable Altair to render in Jupyter-like environments
 alt.data_transformers.enable('json')
 
@@ -26,16 +32,22 @@ class CaliforniaEnergyVisualizer:
     for the California electricity generation dataset.
     """
 
-    def __init__(self, data_path: str = "data/eia_california_generation_annual.csv"):
+    def __init__(self, data_path: str = "data/eia_california_generation_annual.csv",
+                 processed_data: pd.DataFrame = None):
         """
         Initialize the visualizer with data path.
 
         Args:
             data_path (str): Path to the EIA data file
+            processed_data (pd.DataFrame): Optional already-processed long-format
+                frame (see set_processed_data); the CSV is then not parsed
         """
         self.data_path = Path(data_path)
         self.data = None
-        self.processed_data = None
+        self.processed_data = processed_data
+        # Chart-ready view of processed_data, shared by the chart builders
+        self._enriched = None
+        self._enriched_source = None
 
     def load_and_process_data(self) -> pd.DataFrame:
         """
@@ -46,53 +58,8 @@ class CaliforniaEnergyVisualizer:
         """
         print("Loading and processing California energy data...")
 
-        # Read the CSV file, handling the specific EIA format
-        df = pd.read_csv(self.data_path, header=None)
-
-        # Find the row with actual data (where years start)
-        data_start_row = None
-        for i, row in df.iterrows():
-            if str(row.iloc[3]).strip() == '2014':
-                data_start_row = i
-                break
-
-        if data_start_row is None:
-            raise ValueError("Could not find data start row in CSV file")
-
-        # Extract years from header
-        header_row = df.iloc[data_start_row - 1]
-        years = []
-        for col in range(3, len(header_row)):
-            if pd.notna(header_row.iloc[col]) and str(header_row.iloc[col]).strip().isdigit():
-                years.append(int(header_row.iloc[col]))
-
-        # Extract data rows
-        data_rows = []
-        categories = []
-        for i in range(data_start_row, len(df)):
-            row = df.iloc[i]
-            if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip():
-                category = str(row.iloc[0]).strip()
-                categories.append(category)
-
-                values = []
-                for col in range(3, len(years) + 3):
-                    val = row.iloc[col]
-                    if pd.notna(val) and val != '':
-                        try:
-                            values.append(float(val))
-                        except:
-                            values.append(0.0)
-                    else:
-                        values.append(0.0)
-
-                data_rows.append(values)
-
-        # Create dataframe
-        df_data = pd.DataFrame(data_rows, columns=years)
-        df_data['Category'] = categories
-        df_data = df_data.set_index('Category').T
-        df_data.index.name = 'Year'
+        # Shared, cached EIA parser (the same one the analyzer uses)
+        df_data = load_eia_wide(self.data_path)
 
         # Convert to long format for easier plotting
         self.processed_data = df_data.reset_index().melt(
@@ -102,26 +69,71 @@ class CaliforniaEnergyVisualizer:
         )
         return self.processed_data
 
-    def create_stacked_area_chart(self) -> alt.Chart:
+    def set_processed_data(self, processed_data: pd.DataFrame) -> None:
+        """
+        Use an already-processed long-format dataframe instead of re-parsing the CSV.
+
+        Pass CaliforniaEnergyAnalyzer.processed_data here to share one parse
+        between analysis and visualization; load_and_process_data is then skipped.
+
+        Args:
+            processed_data (pd.DataFrame): Frame with Year, Category and Generation_MWh columns
+        """
+        self.processed_data = processed_data
+
+    def _enriched_data(self) -> pd.DataFrame:
+        """
+        Return processed_data with the columns every chart needs, built once.
+
+        Has one row per Year and Category (repeated EIA rows are dropped),
+        with a categorical Category, an int16 Year, a datetime Year_dt and the
+        Percentage of each year's total. Rebuilt only when processed_data is
+        replaced; charts read it without modifying it.
+
+        Returns:
+            pd.DataFrame: Enriched long-format frame
+        """
+        if self.processed_data is None:
+            self.load_and_process_data()
+
+        if self._enriched is None or self._enriched_source is not self.processed_data:
+            # One row per year and category before handing the frame to
+            # Altair, so the embedded JSON stays small. Repeated EIA rows carry
+            # identical values, so keep the first rather than summing them
+            data = (
+                self.processed_data
+                .drop_duplicates(['Year', 'Category'])
+                .loc[:, ['Year', 'Category', 'Generation_MWh']]
+                .reset_index(drop=True)
+            )
+            # Calculate percentages for better visualization
+            totals = data.groupby('Year', sort=False)['Generation_MWh'].transform('sum')
+            self._enriched = data.assign(
+                Category=data['Category'].astype('category'),
+                Year=data['Year'].astype('int16'),
+                Year_dt=pd.to_datetime(data['Year'].astype(str), format='%Y'),
+                Percentage=data['Generation_MWh'] / totals * 100,
+            )
+            self._enriched_source = self.processed_data
+        return self._enriched
+
+    def create_stacked_area_chart(self, df: pd.DataFrame = None) -> alt.Chart:
         """
         Create an interactive stacked area chart.
 
+        Args:
+            df (pd.DataFrame): Enriched data; defaults to _enriched_data()
+
         Returns:
             alt.Chart: Interactive Altair chart
         """
         print("Creating stacked area chart...")
 
-        # Calculate percentages for better visualization
-        totals = self.processed_data.groupby('Year')['Generation_MWh'].sum()
-        data_with_pct = self.processed_data.copy()
-        data_with_pct['Percentage'] = data_with_pct.apply(
-            lambda row: (row['Generation_MWh'] / totals[row['Year']]) * 100,
-            axis=1
-        )
+        data_with_pct = self._enriched_data() if df is None else df
 
         # Color scheme for categories (will be set dynamically)
         # Categories are now loaded from the CSV file
-        categories = self.processed_data['Category'].unique().tolist()
+        categories = data_with_pct['Category'].unique().tolist()
 
         color_scale = alt.Scale(
             domain=categories,
@@ -152,27 +164,28 @@ class CaliforniaEnergyVisualizer:
 
         return chart
 
-    def create_trend_lines(self) -> alt.Chart:
+    def create_trend_lines(self, df: pd.DataFrame = None) -> alt.Chart:
         """
         Create line charts showing trends for each category.
 
+        Args:
+            df (pd.DataFrame): Enriched data; defaults to _enriched_data()
+
         Returns:
             alt.Chart: Line chart showing individual category trends
         """
         print("Creating trend analysis chart...")
 
-        # Calculate year-over-year growth rates
-        yearly_data = self.processed_data.copy()
-        yearly_data['Year'] = pd.to_datetime(yearly_data['Year'], format='%Y')
+        yearly_data = self._enriched_data() if df is None else df
 
         # Create line chart for absolute values
         lines = alt.Chart(yearly_data).mark_line(point=True).encode(
-            x=alt.X('Year:T', title='Year'),
+            x=alt.X('Year_dt:T', title='Year'),
             y=alt.Y('Generation_MWh:Q', title='Generation (thousand MWh)'),
             color=alt.Color('Category:N',
                           legend=alt.Legend(title="Energy Category")),
             tooltip=[
-                alt.Tooltip('Year:T', title='Year'),
+                alt.Tooltip('Year_dt:T', title='Year'),
                 alt.Tooltip('Category:N', title='Category'),
                 alt.Tooltip('Generation_MWh:Q', title='Generation (MWh)', format=',.0f')
             ]
@@ -184,17 +197,26 @@ class CaliforniaEnergyVisualizer:
 
         return lines
 
-    def create_summary_stats_chart(self) -> alt.Chart:
+    def create_summary_stats_chart(self, df: pd.DataFrame = None) -> alt.Chart:
         """
         Create a bar chart of total generation by category.
 
+        Args:
+            df (pd.DataFrame): Enriched data; defaults to _enriched_data()
+
         Returns:
             alt.Chart: Bar chart of total generation per category
         """
         print("Creating summary statistics chart...")
 
-        # Calculate totals per category
-        category_totals = self.processed_data.groupby('Category')['Generation_MWh'].sum().reset_index()
+        data = self._enriched_data() if df is None else df
+
+        # Calculate totals per category (bars are ordered by sort='-y' below)
+        category_totals = (
+            data.groupby('Category', observed=True, sort=False)['Generation_MWh']
+            .sum()
+            .reset_index()
+        )
 
         bars = alt.Chart(category_totals).mark_bar().encode(
             x=alt.X('Category:N', title='Energy Category', sort='-y'),
@@ -225,25 +247,24 @@ class CaliforniaEnergyVisualizer:
 
         print(f"Saving visualizations to {output_path.absolute()}")
 
-        # Load data if not already loaded
-        if self.processed_data is None:
-            self.load_and_process_data()
+        # Load data if not already loaded, and enrich it once for all charts
+        data = self._enriched_data()
 
-        # Generate and save each chart
-        charts = {
-            'stacked_area': self.create_stacked_area_chart(),
-            'trend_lines': self.create_trend_lines(),
-            'summary_stats': self.create_summary_stats_chart()
+        builders = {
+            'stacked_area': self.create_stacked_area_chart,
+            'trend_lines': self.create_trend_lines,
+            'summary_stats': self.create_summary_stats_chart,
         }
 
-        # Save as HTML (interactive)
-        for name, chart in charts.items():
+        def build_and_save(name):
+            chart = builders[name](data)
+
+            # Save as HTML (interactive)
             html_file = output_path / f'{name}_interactive.html'
             chart.save(str(html_file))
             print(f"  Saved {html_file}")
 
-        # Save as PNG (static)
-        for name, chart in charts.items():
+            # Save as PNG (static)
             try:
                 png_file = output_path / f'{name}_static.png'
                 chart.save(str(png_file), ppi=300)
@@ -251,6 +272,13 @@ class CaliforniaEnergyVisualizer:
             except Exception as e:
                 print(f"  Warning: Could not save PNG for {name}: {e}")
 
+        # Each chart writes its own files and the PNG export mostly waits on
+        # the renderer, so build and save the charts in parallel
+        with ThreadPoolExecutor(max_workers=len(builders)) as executor:
+            futures = [executor.submit(build_and_save, name) for name in builders]
+            for future in as_completed(futures):
+                future.result()
+
 
 def main():
     """Main function to run the visualization generation."""
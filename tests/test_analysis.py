@@ -0,0 +1,28 @@
+"""
+California Energy Analysis - Analyzer Tests
+
+Run from the repository root with: python -m pytest tests
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+from src import io_eia
+from src.analysis import CaliforniaEnergyAnalyzer
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "Net_generation_for_California.csv"
+
+
+def test_raw_data_is_writable_and_independent_of_loader_cache():
+    """Editing raw_data in place works and never reaches the shared loader cache."""
+    analyzer = CaliforniaEnergyAnalyzer(str(DATA_PATH))
+    analyzer.load_data(use_cache=False)
+    cached = io_eia.load_eia_wide(DATA_PATH)
+    original = cached.iloc[0, 3]
+
+    assert not np.shares_memory(analyzer.raw_data.to_numpy(), cached.to_numpy())
+    analyzer.raw_data.iloc[0, 3] = -1.0
+
+    assert analyzer.raw_data.iloc[0, 3] == -1.0
+    assert io_eia.load_eia_wide(DATA_PATH).iloc[0, 3] == original
@@ -0,0 +1,28 @@
+"""
+California Energy Analysis - Visualizer Tests
+
+Skipped unless altair (and vl-convert, for the PNG export) is installed.
+"""
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("altair")
+pytest.importorskip("vl_convert")
+
+from src.visualization import CaliforniaEnergyVisualizer
+
+DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "Net_generation_for_California.csv"
+
+
+def test_generate_all_visualizations_writes_every_chart(tmp_path):
+    """The parallel build/save writes an HTML and a PNG file for each chart."""
+    visualizer = CaliforniaEnergyVisualizer(str(DATA_PATH))
+    visualizer.generate_all_visualizations(str(tmp_path))
+
+    for name in ('stacked_area', 'trend_lines', 'summary_stats'):
+        html_file = tmp_path / f'{name}_interactive.html'
+        png_file = tmp_path / f'{name}_static.png'
+        assert html_file.stat().st_size > 0
+        assert png_file.read_bytes()[:8] == b'\x89PNG\r\n\x1a\n'